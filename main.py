@@ -14,15 +14,16 @@ import os
 import logging
 from pathlib import Path
 from PyQt6.QtWidgets import QApplication, QMessageBox
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt6.QtGui import QIcon
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from gui.main_window import MainWindow
 from core.utils import setup_logging, check_dependencies
 
+_ICON_PATH = Path(__file__).parent / "resources" / "icon.png"
+
 
 def check_and_download_tools():
     """Check if tools are available and download if missing."""
@@ -31,23 +32,24 @@ def check_and_download_tools():
     tools_dir = get_tools_dir()
     required_tools = ["apktool.jar", "uber-apk-signer.jar"]
     
-    missing_tools = []
-    for tool in required_tools:
-        if not (tools_dir / tool).exists():
-            missing_tools.append(tool)
+    # One directory read instead of a stat per tool
+    try:
+        present = set(os.listdir(tools_dir))
+    except OSError:
+        present = set()
+    
+    missing_tools = [tool for tool in required_tools if tool not in present]
     
     # Check for JADX
-    jadx_dir = tools_dir / "jadx"
-    if not jadx_dir.exists():
+    if "jadx" not in present:
         missing_tools.append("jadx")
     
     if missing_tools:
         logger = logging.getLogger(__name__)
         logger.info(f"Missing tools: {missing_tools}")
         
-        # Show dialog asking user if they want to download tools
-        from PyQt6.QtWidgets import QMessageBox
-        
+        # Show dialog asking user if they want to download tools; the same
+        # box is reused for the follow-up error or warning
         msg = QMessageBox()
         msg.setIcon(QMessageBox.Icon.Question)
         msg.setWindowTitle("Download Required Tools")
@@ -66,79 +68,128 @@ def check_and_download_tools():
             except Exception as e:
                 logger.error(f"Failed to download tools: {e}")
                 
-                error_msg = QMessageBox()
-                error_msg.setIcon(QMessageBox.Icon.Critical)
-                error_msg.setWindowTitle("Download Failed")
-                error_msg.setText("Failed to download required tools.")
-                error_msg.setInformativeText(f"Error: {e}\n\nPlease download tools manually or check your internet connection.")
-                error_msg.exec()
+                msg.setIcon(QMessageBox.Icon.Critical)
+                msg.setWindowTitle("Download Failed")
+                msg.setText("Failed to download required tools.")
+                msg.setInformativeText(f"Error: {e}\n\nPlease download tools manually or check your internet connection.")
+                msg.setStandardButtons(QMessageBox.StandardButton.Ok)
+                msg.exec()
                 return False
         else:
             # User chose not to download
-            warning_msg = QMessageBox()
-            warning_msg.setIcon(QMessageBox.Icon.Warning)
-            warning_msg.setWindowTitle("Tools Required")
-            warning_msg.setText("APK Purifier requires external tools to function.")
-            warning_msg.setInformativeText("The application may not work properly without these tools. You can download them later from the Help menu.")
-            warning_msg.exec()
+            msg.setIcon(QMessageBox.Icon.Warning)
+            msg.setWindowTitle("Tools Required")
+            msg.setText("APK Purifier requires external tools to function.")
+            msg.setInformativeText("The application may not work properly without these tools. You can download them later from the Help menu.")
+            msg.setStandardButtons(QMessageBox.StandardButton.Ok)
+            msg.exec()
             return False
     
     return True
 
+def _stream_download(session, url, f):
+    """Stream the body of url into the binary file object f."""
+    import shutil
+
+    with session.get(url, stream=True, timeout=30) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        shutil.copyfileobj(response.raw, f, length=1 << 20)
+
+def _download_file(session, url, dest):
+    """Stream url to dest without holding the whole payload in memory."""
+    part = dest.with_name(dest.name + ".part")
+    with open(part, 'wb') as f:
+        _stream_download(session, url, f)
+    # Only expose the file once it is complete so a failed run is retried
+    os.replace(part, dest)
+
+def _install_jadx(session, url, jadx_dir):
+    """Download the JADX release zip and unpack it into jadx_dir."""
+    import tempfile
+    import zipfile
+
+    # Buffer the archive in an anonymous temp file instead of writing and
+    # re-reading tools/jadx.zip (SpooledTemporaryFile is not seekable enough
+    # for zipfile before Python 3.11)
+    with tempfile.TemporaryFile() as buf:
+        _stream_download(session, url, buf)
+        buf.seek(0)
+        with zipfile.ZipFile(buf, 'r') as zip_ref:
+            zip_ref.extractall(jadx_dir)
+    
+    # Make scripts executable on Unix
+    if os.name != 'nt':
+        with os.scandir(jadx_dir / "bin") as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    os.chmod(entry.path, 0o755)
+
 def download_tools_embedded():
     """Download tools using embedded download functionality."""
     import requests
-    import zipfile
-    import shutil
+    from concurrent.futures import ThreadPoolExecutor
     from core.utils import get_tools_dir
     
     tools_dir = get_tools_dir()
     tools_dir.mkdir(exist_ok=True)
     
+    # The downloads are independent, so collect the missing ones and fetch
+    # them concurrently
+    jobs = []
+    
     # Download APKTool
     apktool_url = "https://bitbucket.org/iBotPeaches/apktool/downloads/apktool_2.8.1.jar"
     apktool_path = tools_dir / "apktool.jar"
     
     if not apktool_path.exists():
-        response = requests.get(apktool_url)
-        response.raise_for_status()
-        with open(apktool_path, 'wb') as f:
-            f.write(response.content)
+        jobs.append((_download_file, apktool_url, apktool_path))
     
     # Download uber-apk-signer
     signer_url = "https://github.com/patrickfav/uber-apk-signer/releases/download/v1.2.1/uber-apk-signer-1.2.1.jar"
     signer_path = tools_dir / "uber-apk-signer.jar"
     
     if not signer_path.exists():
-        response = requests.get(signer_url)
-        response.raise_for_status()
-        with open(signer_path, 'wb') as f:
-            f.write(response.content)
+        jobs.append((_download_file, signer_url, signer_path))
     
     # Download JADX
     jadx_url = "https://github.com/skylot/jadx/releases/download/v1.4.7/jadx-1.4.7.zip"
     jadx_dir = tools_dir / "jadx"
     
     if not jadx_dir.exists():
-        response = requests.get(jadx_url)
-        response.raise_for_status()
-        
-        # Save and extract zip
-        jadx_zip = tools_dir / "jadx.zip"
-        with open(jadx_zip, 'wb') as f:
-            f.write(response.content)
-        
-        with zipfile.ZipFile(jadx_zip, 'r') as zip_ref:
-            zip_ref.extractall(jadx_dir)
-        
-        # Make scripts executable on Unix
-        if os.name != 'nt':
-            for script in jadx_dir.glob("bin/*"):
-                if script.is_file():
-                    os.chmod(script, 0o755)
-        
-        # Clean up zip file
-        jadx_zip.unlink()
+        jobs.append((_install_jadx, jadx_url, jadx_dir))
+    
+    if not jobs:
+        return
+    
+    # A shared session keeps connections (and TLS sessions) to github.com
+    # alive across the two GitHub downloads
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        futures = [pool.submit(func, session, url, dest) for func, url, dest in jobs]
+        # Surface the first failure to the caller once all downloads settle
+        for future in futures:
+            future.result()
+
+class _DependencySignals(QObject):
+    """Signals for DependencyCheck (QRunnable is not a QObject)."""
+
+    finished = pyqtSignal(list)
+
+class DependencyCheck(QRunnable):
+    """Run check_dependencies() on a pool thread."""
+
+    def __init__(self):
+        super().__init__()
+        self.signals = _DependencySignals()
+
+    def run(self):
+        try:
+            missing_deps = check_dependencies()
+        except Exception as e:
+            # A failed check should not take the UI down with it
+            logging.getLogger(__name__).error(f"Dependency check failed: {e}", exc_info=True)
+            missing_deps = []
+        self.signals.finished.emit(missing_deps)
 
 def main():
     """Main application entry point."""
@@ -155,9 +206,8 @@ def main():
     app.setOrganizationDomain("krishnendu.com")
 
     # Set application icon if available
-    icon_path = Path(__file__).parent / "resources" / "icon.png"
-    if icon_path.exists():
-        app.setWindowIcon(QIcon(str(icon_path)))
+    if _ICON_PATH.is_file():
+        app.setWindowIcon(QIcon(str(_ICON_PATH)))
 
     try:
         # Check and download tools if needed
@@ -165,22 +215,32 @@ def main():
         if not check_and_download_tools():
             logger.warning("Continuing without all required tools")
 
-        # Check system dependencies
-        logger.info("Checking system dependencies...")
-        missing_deps = check_dependencies()
+        # Create and show main window
+        logger.info("Starting APK Purifier...")
+        # Deferred so the tool check is not held up by the main window module
+        # and everything it pulls in
+        from gui.main_window import MainWindow
+
+        main_window = MainWindow()
+        main_window.show()
+
+        def on_dependencies_checked(missing_deps):
+            if not missing_deps:
+                return
 
-        if missing_deps:
             error_msg = "Missing required dependencies:\n\n"
             error_msg += "\n".join(f"• {dep}" for dep in missing_deps)
             error_msg += "\n\nPlease install the missing dependencies and try again."
 
-            QMessageBox.critical(None, "Missing Dependencies", error_msg)
-            return 1
+            QMessageBox.critical(main_window, "Missing Dependencies", error_msg)
+            app.exit(1)
 
-        # Create and show main window
-        logger.info("Starting APK Purifier...")
-        main_window = MainWindow()
-        main_window.show()
+        # Check system dependencies once the window is up; this runs
+        # java -version, which can take a while
+        logger.info("Checking system dependencies...")
+        dependency_check = DependencyCheck()
+        dependency_check.signals.finished.connect(on_dependencies_checked, Qt.ConnectionType.QueuedConnection)
+        QThreadPool.globalInstance().start(dependency_check)
 
         # Start event loop
         return app.exec()
@@ -8,8 +8,14 @@ import logging
 import shutil
 import subprocess
 import platform
+import threading
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
+
+# Processes started by run_command that have not exited yet
+_running_processes: Set[subprocess.Popen] = set()
+_running_lock = threading.Lock()
+_commands_cancelled = threading.Event()
 
 
 def setup_logging(level: int = logging.INFO) -> None:
@@ -135,6 +141,10 @@ def run_command(cmd: List[str], cwd: Optional[Path] = None, timeout: int = 300)
     if cwd:
         logger.debug(f"Working directory: {cwd}")
 
+    if _commands_cancelled.is_set():
+        logger.info("Command skipped, cancellation requested")
+        return subprocess.CompletedProcess(cmd, -1, "", "Cancelled")
+
     try:
         # Use Popen for better control
         process = subprocess.Popen(
@@ -144,6 +154,13 @@ def run_command(cmd: List[str], cwd: Optional[Path] = None, timeout: int = 300)
             stderr=subprocess.PIPE,
             text=True
         )
+        with _running_lock:
+            _running_processes.add(process)
+            # cancel_running_commands() may have run between the check above
+            # and Popen, in which case it never saw this process
+            cancelled = _commands_cancelled.is_set()
+        if cancelled:
+            process.kill()
         
         # Wait with timeout
         try:
@@ -154,6 +171,9 @@ def run_command(cmd: List[str], cwd: Optional[Path] = None, timeout: int = 300)
             process.kill()
             stdout, stderr = process.communicate()
             returncode = -1
+        finally:
+            with _running_lock:
+                _running_processes.discard(process)
         
         # Create result object
         result = subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
@@ -175,6 +195,42 @@ def run_command(cmd: List[str], cwd: Optional[Path] = None, timeout: int = 300)
         return subprocess.CompletedProcess(cmd, -1, "", str(e))
 
 
+def cancel_running_commands(grace_period: float = 2.0) -> None:
+    """Terminate commands started by run_command and refuse to start new ones.
+
+    Processes that are still alive after ``grace_period`` seconds are killed.
+    Call reset_command_cancellation() before running commands again.
+    """
+    _commands_cancelled.set()
+
+    with _running_lock:
+        processes = list(_running_processes)
+
+    for process in processes:
+        try:
+            process.terminate()
+        except OSError:
+            pass
+
+    def _kill_survivors():
+        for process in processes:
+            if process.poll() is None:
+                try:
+                    process.kill()
+                except OSError:
+                    pass
+
+    if processes:
+        killer = threading.Timer(grace_period, _kill_survivors)
+        killer.daemon = True
+        killer.start()
+
+
+def reset_command_cancellation() -> None:
+    """Allow run_command to start processes again after a cancellation."""
+    _commands_cancelled.clear()
+
+
 def get_system_info() -> Dict[str, Any]:
     """Get system information for debugging."""
     return {
@@ -187,9 +243,17 @@ def get_system_info() -> Dict[str, Any]:
     }
 
 
-def validate_apk_file(file_path: Path) -> bool:
-    """Basic validation of APK file."""
-    if not file_path.exists():
+def validate_apk_file(
+    file_path: Path, stat_result: Optional[os.stat_result] = None, deep: bool = True
+) -> bool:
+    """Basic validation of APK file.
+
+    If the caller already has a stat result for the file it can be passed in
+    to skip the existence check. With ``deep=False`` only the ZIP signature is
+    checked, which is cheap enough to run on the GUI thread; the full check for
+    AndroidManifest.xml and dex files is left to the caller.
+    """
+    if stat_result is None and not file_path.exists():
         return False
 
     if not file_path.suffix.lower() == ".apk":
@@ -199,6 +263,13 @@ def validate_apk_file(file_path: Path) -> bool:
     try:
         import zipfile
 
+        with open(file_path, "rb") as f:
+            if f.read(4) != b"PK\x03\x04":
+                return False
+
+        if not deep:
+            return zipfile.is_zipfile(file_path)
+
         with zipfile.ZipFile(file_path, "r") as zf:
             # Check for AndroidManifest.xml
             if "AndroidManifest.xml" not in zf.namelist():
